@@ -1,24 +1,159 @@
+import atexit
+import contextlib
+import io
+import json
 import logging
+import queue
+import signal
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from types import FrameType
+from typing import Any, TextIO
 
+import orjson
 import structlog
 
 from app.config import get_app_settings
 
+is_production = get_app_settings().ENVIRONMENT == "PRODUCTION"
+log_level = getattr(logging, get_app_settings().LOG_LEVEL.upper())
+
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL_SECONDS = 0.2
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    try:
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS, **kwargs
+        ).decode()
+    except orjson.JSONEncodeError:
+        pass
+    try:
+        return json.dumps(
+            obj,
+            default=kwargs.get("default", repr),
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+    except Exception:
+        return json.dumps(
+            {"event": str(obj.get("event")), "event_dict": repr(obj)},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if (
+                record.levelno >= logging.WARNING
+                or time.monotonic() - self._last_flush
+                >= LOG_FLUSH_INTERVAL_SECONDS
+            ):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
+class _FlushingQueueListener(QueueListener):
+    def __init__(
+        self,
+        log_queue: queue.SimpleQueue[logging.LogRecord],
+        *handlers: logging.Handler,
+    ) -> None:
+        super().__init__(log_queue, *handlers)
+        self._log_queue = log_queue
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self._log_queue.get(
+                block, timeout=LOG_FLUSH_INTERVAL_SECONDS
+            )
+        except queue.Empty:
+            for handler in self.handlers:
+                with contextlib.suppress(OSError, ValueError):
+                    handler.flush()
+            return self._log_queue.get(block)
+
+
+def _exit_on_sigterm(signum: int, frame: FrameType | None) -> None:
+    raise SystemExit(128 + signum)
+
+
+def install_shutdown_handler() -> None:
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+def _buffered_stdout() -> TextIO | None:
+    fileno = getattr(sys.stdout, "fileno", None)
+    if fileno is None:
+        return None
+    try:
+        fd = fileno()
+    except ValueError:
+        return None
+    return io.TextIOWrapper(
+        io.BufferedWriter(
+            io.FileIO(fd, "w", closefd=False),
+            buffer_size=LOG_BUFFER_SIZE,
+        ),
+        encoding="utf-8",
+        errors="backslashreplace",
+    )
+
+
+log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+log_stream = _buffered_stdout() if is_production else None
+if log_stream is not None:
+    log_listener: QueueListener = _FlushingQueueListener(
+        log_queue, _BufferedStreamHandler(log_stream)
+    )
+else:
+    log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+
+stdlib_logger = logging.getLogger("kube_sentinel")
+stdlib_logger.addHandler(QueueHandler(log_queue))
+stdlib_logger.setLevel(log_level)
+stdlib_logger.propagate = False
+
+log_listener.start()
+atexit.register(log_listener.stop)
+
+processors: list[structlog.typing.Processor] = [
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.add_log_level,
+    structlog.processors.StackInfoRenderer(),
+    structlog.dev.set_exc_info,
+    structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=True),
+]
+if is_production:
+    processors += [
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+    ]
+else:
+    processors.append(structlog.dev.ConsoleRenderer())
+
 structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-        structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=True),
-        structlog.dev.ConsoleRenderer(),
-    ],
-    wrapper_class=structlog.make_filtering_bound_logger(
-        min_level=getattr(logging, get_app_settings().LOG_LEVEL.upper())
-    ),
+    processors=processors,
+    wrapper_class=structlog.make_filtering_bound_logger(min_level=log_level),
     context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=get_app_settings().ENVIRONMENT == "PRODUCTION",
+    logger_factory=lambda *args: stdlib_logger,
+    cache_logger_on_first_use=is_production,
 )
 
 
@@ -0,0 +1,6 @@
+import os
+
+os.environ.setdefault("GOOGLE_VERTEX_API_KEY", "test")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test")
+os.environ.setdefault("DATABASE_URL", "postgresql://test")
+os.environ.setdefault("LOG_LEVEL", "INFO")
@@ -0,0 +1,264 @@
+import io
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TextIO
+
+import pytest
+import structlog
+
+from app.utils.logger import (
+    LOG_FLUSH_INTERVAL_SECONDS,
+    _buffered_stdout,
+    _BufferedStreamHandler,
+    _FlushingQueueListener,
+    _orjson_dumps,
+)
+
+render = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+
+
+def _render(**event_dict: Any) -> str:
+    rendered = render(None, "info", {"event": "x", **event_dict})
+    assert isinstance(rendered, str)
+    return rendered
+
+
+class _Structlog:
+    def __structlog__(self) -> str:
+        return "structlog-repr"
+
+
+def _circular() -> dict[str, Any]:
+    circular: dict[str, Any] = {}
+    circular["self"] = circular
+    return circular
+
+
+@pytest.mark.parametrize(
+    "event_dict",
+    [
+        {"d": {200: 5}},
+        {"d": {(1, 2): 5}},
+        {"big": 2**70},
+        {"s": "\ud800"},
+        {"a": _circular()},
+    ],
+)
+def test_renderer_never_raises(event_dict: dict[str, Any]) -> None:
+    assert json.loads(_render(**event_dict))["event"] == "x"
+
+
+def test_renderer_keeps_non_str_keys() -> None:
+    assert json.loads(_render(d={200: 5}))["d"] == {"200": 5}
+
+
+def test_renderer_fallback_keeps_structlog_default() -> None:
+    rendered = _render(big=2**70, s=_Structlog())
+    assert json.loads(rendered)["s"] == "structlog-repr"
+
+
+def test_renderer_fallback_matches_orjson_format() -> None:
+    assert _render(big=2**70, s="é") == (
+        '{"event":"x","big":1180591620717411303424,"s":"é"}'
+    )
+
+
+def test_renderer_falls_back_to_repr_for_unserializable_dicts() -> None:
+    rendered = json.loads(_render(d={(1, 2): 5}))
+    assert rendered["event"] == "x"
+    assert "(1, 2): 5" in rendered["event_dict"]
+
+
+class _RecordingStream(io.StringIO):
+    def __init__(self, fail_flush: bool = False) -> None:
+        super().__init__()
+        self.flushes = 0
+        self.flush_attempts = 0
+        self.fail_flush = fail_flush
+
+    def flush(self) -> None:
+        self.flush_attempts += 1
+        if self.fail_flush:
+            raise BrokenPipeError
+        self.flushes += 1
+
+
+def _record(level: int = logging.INFO, msg: str = "x") -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "msg": msg,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+        }
+    )
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_handler_buffers_info_within_interval() -> None:
+    stream = _RecordingStream()
+    handler = _BufferedStreamHandler(stream)
+    handler.emit(_record())
+    assert stream.getvalue() == "x\n"
+    assert stream.flushes == 0
+
+
+def test_handler_flushes_once_interval_has_elapsed() -> None:
+    stream = _RecordingStream()
+    handler = _BufferedStreamHandler(stream)
+    handler._last_flush -= LOG_FLUSH_INTERVAL_SECONDS
+    handler.emit(_record())
+    assert stream.flushes == 1
+
+
+@pytest.mark.parametrize("level", [logging.WARNING, logging.ERROR])
+def test_handler_flushes_warning_and_above_immediately(level: int) -> None:
+    stream = _RecordingStream()
+    handler = _BufferedStreamHandler(stream)
+    handler.emit(_record(level))
+    assert stream.flushes == 1
+
+
+def test_handler_reports_flush_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    handler = _BufferedStreamHandler(_RecordingStream(fail_flush=True))
+    errors: list[logging.LogRecord] = []
+    monkeypatch.setattr(handler, "handleError", errors.append)
+    record = _record(logging.ERROR)
+    handler.emit(record)
+    assert errors == [record]
+
+
+def test_listener_flushes_when_idle() -> None:
+    stream = _RecordingStream()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = _FlushingQueueListener(
+        log_queue, _BufferedStreamHandler(stream)
+    )
+    listener.start()
+    try:
+        log_queue.put(_record())
+        assert _wait_for(lambda: stream.flushes > 0)
+        assert stream.getvalue() == "x\n"
+    finally:
+        listener.stop()
+
+
+def test_listener_drains_queue_on_stop() -> None:
+    stream = _RecordingStream()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = _FlushingQueueListener(
+        log_queue, _BufferedStreamHandler(stream)
+    )
+    listener.start()
+    for i in range(100):
+        log_queue.put(_record(msg=str(i)))
+    listener.stop()
+    assert stream.getvalue().splitlines() == [str(i) for i in range(100)]
+
+
+def test_listener_survives_broken_stream(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stream = _RecordingStream(fail_flush=True)
+    handler = _BufferedStreamHandler(stream)
+    monkeypatch.setattr(handler, "handleError", lambda record: None)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = _FlushingQueueListener(log_queue, handler)
+    listener.start()
+    try:
+        log_queue.put(_record(logging.ERROR, "first"))
+        # One attempt from emit() on ERROR, the next from the idle flush.
+        assert _wait_for(lambda: stream.flush_attempts >= 2)
+        log_queue.put(_record(logging.ERROR, "second"))
+        log_queue.put(_record(msg="third"))
+        assert _wait_for(lambda: "third" in stream.getvalue())
+        assert stream.getvalue().splitlines() == ["first", "second", "third"]
+    finally:
+        listener.stop()
+
+
+@pytest.mark.parametrize("stdout", [None, io.StringIO()])
+def test_buffered_stdout_requires_a_file_descriptor(
+    monkeypatch: pytest.MonkeyPatch, stdout: TextIO | None
+) -> None:
+    monkeypatch.setattr(sys, "stdout", stdout)
+    assert _buffered_stdout() is None
+
+
+def test_production_logging_without_stdout_fd() -> None:
+    script = """
+import io, sys
+sys.stdout = io.StringIO()
+from app.utils.logger import log, log_listener
+log.info("captured")
+log_listener.stop()
+sys.__stdout__.write(sys.stdout.getvalue())
+"""
+    result = _run_logging_process("PRODUCTION", script)
+    assert result.returncode == 0, result.stderr
+    assert "captured" in result.stdout
+
+
+def _run_logging_process(
+    environment: str, script: str
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[2],
+        env={**os.environ, "ENVIRONMENT": environment, "LOG_LEVEL": "INFO"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+@pytest.mark.parametrize("environment", ["DEVELOPMENT", "PRODUCTION"])
+def test_structlog_output_goes_through_the_queue(environment: str) -> None:
+    script = """
+from app.utils.logger import log, log_listener, log_queue, stdlib_logger
+from logging.handlers import QueueHandler
+assert [type(h) for h in stdlib_logger.handlers] == [QueueHandler]
+assert stdlib_logger.handlers[0].queue is log_queue
+assert log_listener.queue is log_queue
+log.info("wired", n=1)
+"""
+    result = _run_logging_process(environment, script)
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert len(lines) == 2
+    assert "wired" in lines[-1]
+    if environment == "PRODUCTION":
+        assert json.loads(lines[-1])["n"] == 1
+
+
+@pytest.mark.parametrize("environment", ["DEVELOPMENT", "PRODUCTION"])
+def test_sigterm_drains_queued_records(environment: str) -> None:
+    script = """
+import os, signal, time
+from app.utils.logger import install_shutdown_handler, log
+install_shutdown_handler()
+for i in range(20000):
+    log.info("line", i=i)
+os.kill(os.getpid(), signal.SIGTERM)
+time.sleep(30)
+"""
+    result = _run_logging_process(environment, script)
+    assert result.returncode == 128 + signal.SIGTERM, result.stderr
+    assert len(result.stdout.splitlines()) == 20001